@@ -1,36 +1,84 @@
 import os
 import re
+import mmap
 import subprocess
 import difflib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pandas as pd
 from loguru import logger
 
-def parse_build_log(build_log_path):
+# Matches each whole line mentioning "error" or "warning", so finditer() visits a line at most once.
+_DIAGNOSTIC_LINE_RE = re.compile(rb'^[^\n]*?(?:error|warning)[^\n]*', re.IGNORECASE | re.MULTILINE)
+_ERROR_COUNT_RE = re.compile(r"ERROR SUMMARY:\s+(\d+)\s+errors")
+# Files written into the build directory by these scripts, never the program itself.
+_NON_EXECUTABLE_NAMES = frozenset({"build.log", "valgrind.log", "diff.log"})
+# Columns of the CSV report, in the order process_project() returns them.
+REPORT_COLUMNS = (
+    "Project",
+    "Compilation_Errors",
+    "Compilation_Warnings",
+    "Compilation_Status",
+    "Build_Failure",
+    "Executable",
+    "Valgrind_Status",
+    "Valgrind_Error_Summary",
+    "Output_Comparison",
+    "Diff_Log",
+)
+
+def parse_build_log(build_log):
     """
     Parse build.log to extract compilation errors and warnings.
+    build_log is either a path or an os.DirEntry from a scan of the build directory,
+    in which case its cached stat result is used instead of querying the file again.
+    The log must exist; callers check for it before calling.
     Returns a tuple: (error_count, warning_count).
     Uses a simple heuristic that counts lines containing "error" or "warning".
+    The log is memory-mapped and scanned once; only the matching lines are inspected further.
     """
     errors = 0
     warnings = 0
-    if not os.path.exists(build_log_path):
+    if isinstance(build_log, os.DirEntry):
+        size = build_log.stat().st_size
+    else:
+        size = os.path.getsize(build_log)
+    if size == 0:
         return errors, warnings
-    with open(build_log_path, 'r') as f:
-        for line in f:
-            if re.search(r'error', line, re.IGNORECASE):
-                errors += 1
-            if re.search(r'warning', line, re.IGNORECASE):
-                warnings += 1
+    with open(build_log, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in _DIAGNOSTIC_LINE_RE.finditer(mm):
+                line = match.group().lower()
+                errors += b'error' in line
+                warnings += b'warning' in line
     return errors, warnings
 
-def find_executable(build_dir):
+def scan_directory(directory):
+    """
+    Lists a directory once with os.scandir and returns a dict mapping entry names to
+    their os.DirEntry objects, so later checks can reuse the cached metadata.
+    """
+    with os.scandir(directory) as entries:
+        return {entry.name: entry for entry in entries}
+
+def find_executable(build_dir, build_entries=None):
     """
     Searches the build directory for an executable file.
     Returns the first file that is executable (ignoring build.log, valgrind.log, and diff.log).
+    The top level of the build directory, where make places the program, is checked first
+    using cached directory entries (build_entries from scan_directory(), if already
+    available); subdirectories are only walked if nothing is found there.
     """
+    if build_entries is None:
+        build_entries = scan_directory(build_dir)
+    for entry in build_entries.values():
+        if entry.name in _NON_EXECUTABLE_NAMES:
+            continue
+        if entry.is_file() and entry.stat().st_mode & 0o111:
+            return entry.path
     for root, dirs, files in os.walk(build_dir):
         for file in files:
-            if file in ["build.log", "valgrind.log", "diff.log"]:
+            if file in _NON_EXECUTABLE_NAMES:
                 continue
             file_path = os.path.join(root, file)
             if os.path.isfile(file_path) and os.access(file_path, os.X_OK):
@@ -40,41 +88,45 @@ def find_executable(build_dir):
 def run_valgrind(executable_path, build_dir):
     """
     Runs Valgrind on the executable with full leak-check.
-    Writes the output to 'valgrind.log' in the build directory.
-    Returns a tuple: (exit_code, output).
+    Streams stdout and stderr into 'valgrind.log' in the build directory line by line,
+    watching for the ERROR SUMMARY and fatal startup lines as they go past, so the log
+    does not need to be parsed again afterwards.
+    Returns a tuple: (exit_code, memory_status, error_summary), with the last two as
+    described in summarize_valgrind().
     """
     log_path = os.path.join(build_dir, "valgrind.log")
-    cmd = f"valgrind --leak-check=full {executable_path}"
+    cmd = ["valgrind", "--leak-check=full", executable_path]
+    error_summary = None
+    fatal = False
     try:
-        result = subprocess.run(
-            cmd, shell=True,
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            text=True
-        )
-        output = result.stdout + "\n" + result.stderr
-        with open(log_path, "w") as f:
-            f.write(output)
+        with open(log_path, "w") as f, subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors='replace', bufsize=1 << 16
+        ) as process:
+            for line in process.stdout:
+                f.write(line)
+                if "ERROR SUMMARY:" in line:
+                    error_summary = line[line.index("ERROR SUMMARY:"):].strip()
+                elif "Fatal error at startup" in line:
+                    fatal = True
         logger.info("Valgrind output written to {}", log_path)
-        return result.returncode, output
+        return (process.returncode,) + summarize_valgrind(error_summary, fatal)
     except Exception as e:
         logger.error("Error running Valgrind on {}: {}", executable_path, e)
-        return -1, ""
+        return (-1,) + summarize_valgrind(None)
 
-def parse_valgrind_log(valgrind_output):
+def summarize_valgrind(error_summary, fatal=False):
     """
-    Parses the Valgrind output to determine if memory issues were found.
-    Also extracts the "ERROR SUMMARY" line.
-    Returns a tuple (memory_status, error_summary) where:
+    Turns what was found in Valgrind's output into a tuple (memory_status, error_summary) where:
     - memory_status: "OK" if no errors are found, "Memory issues" if errors > 0,
       "Valgrind Error" if a fatal error is detected, or "Unknown".
     - error_summary: the full ERROR SUMMARY line if found, otherwise "N/A".
     """
-    if "Fatal error at startup" in valgrind_output:
+    if fatal:
         return "Valgrind Error", "Fatal error at startup"
-    match = re.search(r"(ERROR SUMMARY:\s+\d+\s+errors.*)", valgrind_output)
-    if match:
-        error_summary = match.group(1).strip()
-        error_count_match = re.search(r"ERROR SUMMARY:\s+(\d+)\s+errors", error_summary)
+    if error_summary:
+        error_count_match = _ERROR_COUNT_RE.search(error_summary)
         if error_count_match:
             error_count = int(error_count_match.group(1))
             memory_status = "OK" if error_count == 0 else "Memory issues"
@@ -98,23 +150,99 @@ def run_program(executable_path):
         logger.error("Error running program {}: {}", executable_path, e)
         return ""
 
-def generate_diff(actual, expected):
+def normalize_output(text):
+    """
+    Splits program output into lines, dropping blank lines and removing all whitespace
+    from the remaining ones.
+    """
+    # str.split() with no arguments splits on any whitespace in a single C-level pass.
+    normalized = (''.join(line.split()) for line in text.splitlines())
+    return [line for line in normalized if line]
+
+def generate_diff(actual, expected_lines):
     """
-    Generates a unified diff between the actual and expected outputs,
+    Generates a unified diff between the actual output and the expected output lines,
     ignoring differences in whitespace.
     Blank lines are ignored.
+    expected_lines must already be normalized with normalize_output(), so that work is
+    done once per run rather than once per project.
+    Returns an empty string without running difflib when the normalized outputs are equal.
     """
-    # Normalize lines by removing all whitespace.
-    def normalize(line):
-        return re.sub(r'\s+', '', line)
-    
-    actual_lines = [normalize(line) for line in actual.splitlines() if line.strip() != '']
-    expected_lines = [normalize(line) for line in expected.splitlines() if line.strip() != '']
+    actual_lines = normalize_output(actual)
+    # Matching outputs are the common case; skip difflib entirely for them.
+    if actual_lines == expected_lines:
+        return ""
     diff_lines = list(difflib.unified_diff(expected_lines, actual_lines,
                                            fromfile="expected", tofile="actual",
                                            lineterm=""))
     return "\n".join(diff_lines)
 
+def process_project(project_dir, expected_lines=None):
+    """
+    Runs all checks for a single project directory containing a 'build' folder
+    and returns one row of the report as a tuple ordered like REPORT_COLUMNS.
+    """
+    build_dir = os.path.join(project_dir, "build")
+    build_entries = scan_directory(build_dir)
+    if "build.log" in build_entries:
+        comp_errors, comp_warnings = parse_build_log(build_entries["build.log"])
+    else:
+        comp_errors, comp_warnings = 0, 0
+    compilation_status = "OK" if comp_errors == 0 else "Errors"
+    project_name = os.path.basename(project_dir)
+    exe_path = find_executable(build_dir, build_entries)
+    # Failed builds are common when grading; report them without spawning any process.
+    if not exe_path:
+        return (project_name, comp_errors, comp_warnings, compilation_status, "Yes",
+                "", "No executable found", "N/A", "N/A", "N/A")
+    if comp_errors > 0:
+        return (project_name, comp_errors, comp_warnings, compilation_status, "Yes",
+                exe_path, "N/A", "N/A", "N/A", "N/A")
+
+    ret, memory_status, valgrind_summary = run_valgrind(exe_path, build_dir)
+    output_comparison = "N/A"
+    diff_log_path = "N/A"
+    # If expected output is provided, run the program and compare outputs.
+    if expected_lines is not None:
+        actual_output = run_program(exe_path)
+        diff_text = generate_diff(actual_output, expected_lines)
+        # Save the diff to diff.log in the build directory.
+        diff_log_path = os.path.join(build_dir, "diff.log")
+        with open(diff_log_path, "w") as f:
+            f.write(diff_text)
+        output_comparison = "Matches" if diff_text.strip() == "" else "Differs"
+    return (
+        project_name,
+        comp_errors,
+        comp_warnings,
+        compilation_status,
+        "No",
+        exe_path,
+        memory_status,
+        valgrind_summary,
+        output_comparison,
+        diff_log_path
+    )
+
+def find_project_dirs(output_dir):
+    """
+    Yields every directory under output_dir (including itself) that contains a 'build'
+    subdirectory. Uses os.scandir so directory checks come from the cached entries,
+    and does not descend into the build directories themselves.
+    """
+    stack = [output_dir]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+        if any(entry.name == "build" for entry in subdirs):
+            yield current
+        # Push in reverse so directories are visited in listing order, like os.walk.
+        stack.extend(entry.path for entry in reversed(subdirs) if entry.name != "build")
+
 def main(output_dir, report_csv="report.csv", expected_file=None):
     """
     Traverse the output directory (produced by the build script) to find each built project.
@@ -126,68 +254,25 @@ def main(output_dir, report_csv="report.csv", expected_file=None):
       - Additionally, if an expected output file is provided, run the executable normally,
         compare its output (ignoring blank lines and whitespace differences) with the expected output,
         and generate a diff saved in 'diff.log'.
+    Projects are checked in parallel, one worker process per CPU core.
     Collected data is stored in a CSV report.
     """
-    # Read expected output if provided.
-    expected_output = None
+    # Read and normalize expected output if provided.
+    expected_lines = None
     if expected_file and os.path.exists(expected_file):
         with open(expected_file, 'r') as f:
-            expected_output = f.read().strip()
+            expected_lines = normalize_output(f.read().strip())
 
-    data = []
-    for root, dirs, files in os.walk(output_dir):
-        if "build" in dirs:
-            project_dir = root
-            build_dir = os.path.join(project_dir, "build")
-            build_log_path = os.path.join(build_dir, "build.log")
-            comp_errors, comp_warnings = parse_build_log(build_log_path)
-            compilation_status = "OK" if comp_errors == 0 else "Errors"
-            build_failure = "No"
-            if comp_errors > 0:
-                build_failure = "Yes"
-            exe_path = find_executable(build_dir)
-            if not exe_path:
-                build_failure = "Yes"
-                memory_status = "No executable found"
-                valgrind_summary = "N/A"
-                output_comparison = "N/A"
-                diff_log_path = "N/A"
-            else:
-                if build_failure == "Yes":
-                    memory_status = "N/A"
-                    valgrind_summary = "N/A"
-                    output_comparison = "N/A"
-                    diff_log_path = "N/A"
-                else:
-                    ret, valgrind_output = run_valgrind(exe_path, build_dir)
-                    memory_status, valgrind_summary = parse_valgrind_log(valgrind_output)
-                    # If expected output is provided, run the program and compare outputs.
-                    if expected_output is not None:
-                        actual_output = run_program(exe_path)
-                        diff_text = generate_diff(actual_output, expected_output)
-                        # Save the diff to diff.log in the build directory.
-                        diff_log_path = os.path.join(build_dir, "diff.log")
-                        with open(diff_log_path, "w") as f:
-                            f.write(diff_text)
-                        output_comparison = "Matches" if diff_text.strip() == "" else "Differs"
-                    else:
-                        output_comparison = "N/A"
-                        diff_log_path = "N/A"
-            project_name = os.path.basename(project_dir)
-            data.append({
-                "Project": project_name,
-                "Compilation_Errors": comp_errors,
-                "Compilation_Warnings": comp_warnings,
-                "Compilation_Status": compilation_status,
-                "Build_Failure": build_failure,
-                "Executable": exe_path if exe_path else "",
-                "Valgrind_Status": memory_status,
-                "Valgrind_Error_Summary": valgrind_summary,
-                "Output_Comparison": output_comparison,
-                "Diff_Log": diff_log_path
-            })
-    df = pd.DataFrame(data)
-    df.to_csv(report_csv, index=False)
+    project_dirs = list(find_project_dirs(output_dir))
+    columns = {name: [] for name in REPORT_COLUMNS}
+    column_lists = [columns[name] for name in REPORT_COLUMNS]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for row in executor.map(partial(process_project, expected_lines=expected_lines),
+                                project_dirs):
+            for column, value in zip(column_lists, row):
+                column.append(value)
+    df = pd.DataFrame(columns)
+    df.to_csv(report_csv, index=False, lineterminator='\n')
     print("Report generated:", report_csv)
     print(df)
 
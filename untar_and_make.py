@@ -1,26 +1,63 @@
 import os
+import sys
+import shlex
+import hashlib
 import tarfile
 import zipfile
 import shutil
 import argparse
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from loguru import logger
 
+# Native extraction and build tools, looked up once at startup.
+_BSDTAR = shutil.which("bsdtar")
+_TAR = shutil.which("tar")
+_PIGZ = shutil.which("pigz")
+_UNZIP = shutil.which("unzip")
+# Ninja is preferred over Make as the CMake generator when installed.
+_NINJA = shutil.which("ninja")
+# ccache, when installed, caches object files across all projects built in a run.
+_CCACHE = shutil.which("ccache")
+# Directories that never contain a student's Main.cpp and are not searched.
+_SKIPPED_SEARCH_DIRS = frozenset({"build", ".git", ".vscode", ".idea", "CMakeFiles", "node_modules", "__MACOSX"})
+# File in the build folder recording the archive of the last successful build.
+_ARCHIVE_STAMP_NAME = ".archive_stamp"
+# Supported archive suffixes with their format and suffix length.
+_ARCHIVE_SUFFIXES = ((".tar.gz", "tar", 7), (".tgz", "tar", 4), (".zip", "zip", 4))
+
+def move_entry(src, dst):
+    """
+    Moves a file or directory to dst, which is expected not to exist yet.
+    Both paths normally lie in the same extracted tree, so a plain os.rename does the job;
+    shutil.move is only used when that fails (e.g. across filesystems).
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
 def simplify_extracted_directory(target_directory):
     """
     Simplify the extracted directory structure by flattening out unnecessary single-directory wrappers.
     If target_directory contains exactly one subdirectory and no files, move that subdirectory's contents up 
     and remove the redundant folder. Repeat until no single subdirectory remains.
+    Uses os.scandir so the directory check comes from the cached entry type.
     """
     while True:
-        items = os.listdir(target_directory)
-        if len(items) == 1:
-            single_item = os.path.join(target_directory, items[0])
-            if os.path.isdir(single_item):
-                for sub_item in os.listdir(single_item):
-                    src = os.path.join(single_item, sub_item)
-                    dst = os.path.join(target_directory, sub_item)
-                    shutil.move(src, dst)
+        with os.scandir(target_directory) as it:
+            entries = list(it)
+        if len(entries) == 1:
+            single_item = entries[0].path
+            if entries[0].is_dir(follow_symlinks=False):
+                with os.scandir(single_item) as it:
+                    sub_entries = list(it)
+                for sub_entry in sub_entries:
+                    dst = os.path.join(target_directory, sub_entry.name)
+                    move_entry(sub_entry.path, dst)
                 os.rmdir(single_item)
                 logger.info("Simplified directory structure by removing redundant folder: {}", single_item)
                 continue
@@ -29,47 +66,69 @@ def simplify_extracted_directory(target_directory):
 def remove_whitespace_from_paths(directory):
     """
     Recursively renames all files and directories in the given directory by removing whitespace characters from their names.
+    Subdirectories are handled before their own entry is renamed, using a single os.scandir listing per directory.
+    Returns the (renamed) names of the subdirectories directly inside the given directory.
     """
-    for root, dirs, files in os.walk(directory, topdown=False):
-        for file in files:
-            new_file = file.replace(" ", "_")
-            if new_file != file:
-                old_path = os.path.join(root, file)
-                new_path = os.path.join(root, new_file)
-                os.rename(old_path, new_path)
-                logger.info("Renamed file {} to {}", old_path, new_path)
-        for d in dirs:
-            new_d = d.replace(" ", "_")
-            if new_d != d:
-                old_path = os.path.join(root, d)
-                new_path = os.path.join(root, new_d)
-                os.rename(old_path, new_path)
-                logger.info("Renamed directory {} to {}", old_path, new_path)
-
-def remove_assignsubmission_folder(directory):
+    with os.scandir(directory) as it:
+        entries = list(it)
+    subdirs = []
+    for entry in entries:
+        # Decided once, before the rename below invalidates entry.path; symlinks are never followed.
+        is_dir = entry.is_dir(follow_symlinks=False)
+        if is_dir:
+            remove_whitespace_from_paths(entry.path)
+        name = entry.name
+        if " " in name:
+            name = name.replace(" ", "_")
+            new_path = os.path.join(directory, name)
+            os.rename(entry.path, new_path)
+            if is_dir:
+                logger.debug("Renamed directory {} to {}", entry.path, new_path)
+            else:
+                logger.debug("Renamed file {} to {}", entry.path, new_path)
+        if is_dir:
+            subdirs.append(name)
+    return subdirs
+
+def remove_assignsubmission_folder(directory, subdirs=None):
     """
     Checks for any subdirectory whose name contains '_assignsubmission_file'.
     If found, moves its contents up to the given directory and removes the folder.
+    subdirs may list the subdirectory names when the caller already knows them,
+    which saves listing the directory again.
     """
-    for item in os.listdir(directory):
+    if subdirs is None:
+        subdirs = [item for item in os.listdir(directory) if os.path.isdir(os.path.join(directory, item))]
+    for item in subdirs:
         item_path = os.path.join(directory, item)
-        if os.path.isdir(item_path) and "_assignsubmission_file" in item:
+        if "_assignsubmission_file" in item:
             for sub_item in os.listdir(item_path):
                 src = os.path.join(item_path, sub_item)
                 dst = os.path.join(directory, sub_item)
-                shutil.move(src, dst)
+                move_entry(src, dst)
             os.rmdir(item_path)
             logger.info("Removed assignsubmission folder: {}", item_path)
 
-def filter_specific_warning(text):
+def normalize_tree(target_directory):
+    """
+    Cleans up a freshly extracted directory: flattens single-directory wrappers at the top,
+    removes whitespace from all names, and removes any extra '_assignsubmission_file' folder layer.
+    The whitespace pass is the only full traversal; it also reports the top-level
+    subdirectories, so the '_assignsubmission_file' check does not list the directory again.
+    """
+    simplify_extracted_directory(target_directory)
+    top_level_dirs = remove_whitespace_from_paths(target_directory)
+    remove_assignsubmission_folder(target_directory, top_level_dirs)
+
+def filter_specific_warning(lines):
     """
     Filters out the specific CMake deprecation warning regarding compatibility with CMake < 3.5.
     Only removes the block of text associated with that warning, leaving other warnings intact.
+    Takes an iterable of lines and lazily yields the ones to keep, so it can filter a stream.
     """
-    lines = text.splitlines(keepends=True)
-    filtered_lines = []
     skip = False
     for line in lines:
+        # Two substring tests are cheaper per line than a regex search.
         if not skip and "CMake Deprecation Warning" in line and "cmake_minimum_required" in line:
             skip = True
             continue
@@ -78,82 +137,299 @@ def filter_specific_warning(text):
                 continue
             else:
                 skip = False
-        filtered_lines.append(line)
-    return "".join(filtered_lines)
+        yield line
 
-def run_command(command, working_directory):
+def run_command(command, working_directory, log_file):
     """
-    Runs a shell command in the specified working directory.
-    Captures stdout and stderr, filters out the specific CMake deprecation warning for cmake commands,
-    logs the results, and returns a tuple (return_code, stdout, stderr).
+    Runs a command, given as an argument list, in the specified working directory without a shell.
+    Streams stdout and stderr line by line as they are produced: each line is written to log_file
+    and logged (stdout as info, stderr as errors), with the specific CMake deprecation warning
+    filtered out of cmake output on the fly. Returns the command's return code.
     """
-    logger.info("Running command '{}' in directory '{}'", command, working_directory)
-    process = subprocess.Popen(
+    logger.info("Running command '{}' in directory '{}'", shlex.join(command), working_directory)
+    write_lock = threading.Lock()
+    pump_errors = []
+
+    def pump(stream, level):
+        try:
+            # If this is a cmake command, filter out only the specific deprecation warning.
+            lines = filter_specific_warning(stream) if command[0] == "cmake" else stream
+            for line in lines:
+                with write_lock:
+                    log_file.write(line)
+                logger.log(level, "{}", line.rstrip("\n"))
+        except Exception as e:
+            pump_errors.append(e)
+        finally:
+            # Discard whatever is left so a failed pump never leaves the command blocked on a full pipe.
+            while stream.buffer.read(1 << 16):
+                pass
+
+    with subprocess.Popen(
         command,
-        shell=True,
         cwd=working_directory,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True
-    )
-    stdout, stderr = process.communicate()
-    
-    # If this is a cmake command, filter out only the specific deprecation warning.
-    if "cmake" in command:
-        stdout = filter_specific_warning(stdout)
-        stderr = filter_specific_warning(stderr)
-    
-    if stdout:
-        logger.info("Command output:\n{}", stdout)
-    if stderr:
-        logger.error("Command errors:\n{}", stderr)
-    return process.returncode, stdout, stderr
+        text=True,
+        errors="replace"
+    ) as process:
+        # stderr is drained on its own thread so neither pipe can fill up and block the command.
+        stderr_thread = threading.Thread(target=pump, args=(process.stderr, "ERROR"))
+        stderr_thread.start()
+        pump(process.stdout, "INFO")
+        stderr_thread.join()
+    if pump_errors:
+        raise pump_errors[0]
+    return process.returncode
+
+def open_sequential(path):
+    """
+    Opens a file for one front-to-back binary read with a 1 MiB buffer.
+    Where supported, the kernel is told the access is sequential and asked to start reading ahead,
+    which reduces read stalls on slow or networked filesystems. If the hints are rejected, the
+    file is still opened normally.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                # Only a hint; some filesystems reject it.
+                pass
+        return os.fdopen(fd, "rb", buffering=1 << 20)
+    except BaseException:
+        os.close(fd)
+        raise
+
+def prefetch_file(path):
+    """
+    Asks the kernel to start reading the whole file into the page cache, where supported,
+    without opening a buffered Python file object for it. Being only a hint, it never fails:
+    any error is ignored and left for the actual reader to run into.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        # Only a hint; some filesystems reject it.
+        pass
+    finally:
+        os.close(fd)
+
+def extract_with_native_tool(command, archive_path):
+    """
+    Runs an external extraction command (bsdtar, tar or unzip).
+    Returns True if it succeeded, or False if the caller should fall back to the Python modules.
+    """
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        logger.warning("'{}' failed for {} with return code {}: {}",
+                       command[0], archive_path, result.returncode, result.stderr.strip())
+        return False
+    return True
+
+def ensure_dir(path, created):
+    """
+    Creates the directory (and its parents) unless it is already recorded in the set created,
+    then records it and its parents there, so repeated requests cost no syscalls.
+    The set must only be shared while nothing removes directories, e.g. within one extraction.
+    """
+    if path in created:
+        return
+    os.makedirs(path, exist_ok=True)
+    while path and path not in created:
+        created.add(path)
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+def extract_zip_members(archive_path, target_directory, names):
+    """
+    Extracts the named members of a zip archive using a ZipFile handle of its own,
+    so several calls can run in parallel threads.
+    """
+    with zipfile.ZipFile(archive_path, "r") as zip_ref:
+        for name in names:
+            zip_ref.extract(name, target_directory)
+
+def zip_member_directory(info):
+    """
+    Returns the directory, relative to the extraction target, that ZipFile.extract puts the
+    member in (the member itself for directory entries), or "" for the target itself.
+    Drive letters, empty, '.' and '..' components are dropped the same way ZipFile.extract
+    sanitizes them, so unsafe members map to the folders they are really written to.
+    """
+    arcname = info.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [part for part in arcname.split(os.path.sep) if part not in ("", os.path.curdir, os.path.pardir)]
+    if not info.is_dir():
+        parts = parts[:-1]
+    return os.path.join(*parts) if parts else ""
+
+def extract_zip(archive_path, target_directory, workers=None):
+    """
+    Extracts a zip archive with a pool of threads, each decompressing a share of the members.
+    Output directories, including the sanitized ones of unsafe members, are created once up
+    front instead of per member, so no two threads race to create the same folder.
+    zlib releases the GIL while inflating, so the threads run concurrently.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with zipfile.ZipFile(archive_path, "r") as zip_ref:
+        infos = zip_ref.infolist()
+    created = set()
+    names = []
+    for info in infos:
+        member_dir = zip_member_directory(info)
+        if member_dir:
+            ensure_dir(os.path.join(target_directory, member_dir), created)
+        if not info.is_dir():
+            names.append(info.filename)
+    workers = max(1, min(workers, len(names)))
+    chunks = [names[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(partial(extract_zip_members, archive_path, target_directory), chunks))
+
+def classify_archive(file_name):
+    """
+    Determines the archive format from a file name (case-insensitively).
+    Returns a tuple (kind, stem) where kind is "tar" or "zip" and stem is the name without
+    the archive suffix, or (None, None) if the file is not a supported archive.
+    """
+    lower_name = file_name.lower()
+    for suffix, kind, length in _ARCHIVE_SUFFIXES:
+        if lower_name.endswith(suffix):
+            return kind, file_name[:-length]
+    return None, None
+
+def native_extract_command(archive_path, target_directory, kind):
+    """
+    Returns the argument list for extracting the archive, of the given kind ("tar" or "zip",
+    see classify_archive), with a native tool, or None if none is installed.
+    bsdtar (libarchive) handles both tarballs and zips and is preferred; otherwise tar (decompressing
+    with pigz when installed) is used for tarballs and unzip for zips.
+    File timestamps, ownership and stored permissions are not restored, as the build does not need them.
+    """
+    if _BSDTAR:
+        return [_BSDTAR, "-xf", archive_path, "-C", target_directory,
+                "--no-same-owner", "--no-same-permissions", "-m"]
+    if kind == "zip":
+        if _UNZIP:
+            return [_UNZIP, "-q", "-o", "-DD", archive_path, "-d", target_directory]
+        return None
+    if _TAR:
+        command = [_TAR, "-xf", archive_path, "-C", target_directory, "--no-same-owner", "-m"]
+        if _PIGZ:
+            command.insert(1, "--use-compress-program=pigz")
+        return command
+    return None
 
 def extract_archive(archive_path, target_directory):
     """
     Extracts the archive (tar.gz, .tgz, or .zip) into the target directory.
+    Native tools (see native_extract_command) are used when available, since they are much
+    faster than tarfile and zipfile; the Python modules are the fallback.
     Then simplifies the directory structure, removes whitespace characters from paths, and
     removes any extra '_assignsubmission_file' folder layer.
     """
-    if archive_path.endswith((".tar.gz", ".tgz")):
-        try:
-            os.makedirs(target_directory, exist_ok=True)
-            with tarfile.open(archive_path, "r:*") as tar:
-                tar.extractall(path=target_directory)
-            logger.info("Extracted {} into {}", archive_path, target_directory)
-        except Exception as e:
-            logger.error("Error extracting {}: {}", archive_path, e)
-    elif archive_path.endswith(".zip"):
+    kind, _ = classify_archive(os.path.basename(archive_path))
+    if kind is not None:
         try:
             os.makedirs(target_directory, exist_ok=True)
-            with zipfile.ZipFile(archive_path, "r") as zip_ref:
-                zip_ref.extractall(target_directory)
+            command = native_extract_command(archive_path, target_directory, kind)
+            if command is not None:
+                # Start readahead into the page cache before handing the archive to the tool.
+                prefetch_file(archive_path)
+            if command is None or not extract_with_native_tool(command, archive_path):
+                if kind == "zip":
+                    extract_zip(archive_path, target_directory)
+                else:
+                    # Stream mode decompresses once, front to back, without building a member index first.
+                    with open_sequential(archive_path) as archive_file, \
+                            tarfile.open(fileobj=archive_file, mode="r|*") as tar:
+                        for member in tar:
+                            tar.extract(member, path=target_directory, set_attrs=False)
             logger.info("Extracted {} into {}", archive_path, target_directory)
         except Exception as e:
             logger.error("Error extracting {}: {}", archive_path, e)
     else:
         logger.warning("Unsupported file format: {}", archive_path)
     
-    simplify_extracted_directory(target_directory)
-    remove_whitespace_from_paths(target_directory)
-    remove_assignsubmission_folder(target_directory)
+    normalize_tree(target_directory)
 
 def find_main_cpp_directory(directory):
     """
-    Recursively searches for the directory containing 'Main.cpp' within the given directory.
-    Returns the path to that directory if found, otherwise returns None.
+    Searches the given directory breadth-first for the directory containing 'Main.cpp'.
+    Returns the shallowest such directory if found, otherwise returns None.
+    Stops as soon as a match is found, so deeper subdirectories are not scanned, and never
+    descends into build output, VCS or editor folders (see _SKIPPED_SEARCH_DIRS).
     """
-    for root, dirs, files in os.walk(directory):
-        if "Main.cpp" in files:
-            return root
+    pending = deque([directory])
+    while pending:
+        current = pending.popleft()
+        subdirs = []
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIPPED_SEARCH_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name == "Main.cpp" and entry.is_file():
+                    return current
+        pending.extend(subdirs)
     return None
 
-def build_project(project_directory):
+def compute_archive_stamp(archive_path):
+    """
+    Returns a digest of the archive's contents, read in 1 MiB chunks.
+    The archive is hashed rather than the extracted sources: extracting it again on top of an
+    already flattened project recreates its wrapper folders, so that tree never matches twice.
+    """
+    digest = hashlib.sha256()
+    with open_sequential(archive_path) as f:
+        for chunk in iter(partial(f.read, 1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_build_current(project_directory, archive_stamp):
+    """
+    Returns True if the project already has a successful build made from an archive with
+    the given stamp (see compute_archive_stamp), otherwise False.
+    """
+    if not os.path.isdir(project_directory):
+        return False
+    main_cpp_dir = find_main_cpp_directory(project_directory)
+    if main_cpp_dir is None:
+        return False
+    try:
+        with open(os.path.join(main_cpp_dir, "build", _ARCHIVE_STAMP_NAME), "r") as f:
+            return f.read().strip() == archive_stamp
+    except OSError:
+        return False
+
+def build_project(project_directory, build_jobs=None, archive_stamp=None):
     """
     Searches for the folder containing 'Main.cpp' within the project_directory.
     If found, deletes any existing 'build' folder, creates a new one,
-    runs cmake and make in it, and saves the output of these commands to a build.log file.
+    runs cmake and the build in it, and saves the output of these commands to a build.log file.
+    Projects are configured with the Ninja generator when ninja is installed; otherwise cmake
+    uses its default generator (Makefiles, unless CMAKE_GENERATOR is set). Compilation goes
+    through ccache when it is available, and the build runs with build_jobs parallel jobs,
+    defaulting to the number of CPU cores.
+    After a successful build, archive_stamp (if given) is stored in the build folder, so that
+    process_archive() can skip the project while its archive stays the same.
     """
+    if build_jobs is None:
+        build_jobs = os.cpu_count() or 1
     main_cpp_dir = find_main_cpp_directory(project_directory)
     if main_cpp_dir is None:
         logger.warning("Main.cpp not found in project {}. Skipping build.", project_directory)
@@ -161,7 +437,7 @@ def build_project(project_directory):
 
     logger.info("Found Main.cpp in directory: {}", main_cpp_dir)
     build_dir = os.path.join(main_cpp_dir, "build")
-    
+
     if os.path.exists(build_dir):
         try:
             shutil.rmtree(build_dir)
@@ -174,30 +450,130 @@ def build_project(project_directory):
     
     try:
         with open(build_log_path, "w") as log_file:
-            log_file.write("=== Running cmake .. ===\n")
-            cmake_command = "cmake .."
-            ret, out, err = run_command(cmake_command, build_dir)
-            log_file.write(out)
-            log_file.write(err)
+            cmake_command = ["cmake", ".."]
+            if _NINJA:
+                cmake_command[1:1] = ["-G", "Ninja"]
+                logger.info("Configuring {} with the Ninja generator", main_cpp_dir)
+            else:
+                # No -G, so a CMAKE_GENERATOR set in the environment still applies.
+                logger.info("Configuring {} with cmake's default generator", main_cpp_dir)
+            if _CCACHE:
+                # Identical translation units across submissions are then compiled only once.
+                cmake_command[-1:-1] = ["-DCMAKE_C_COMPILER_LAUNCHER=" + _CCACHE,
+                                        "-DCMAKE_CXX_COMPILER_LAUNCHER=" + _CCACHE]
+            log_file.write("=== Running {} ===\n".format(shlex.join(cmake_command)))
+            ret = run_command(cmake_command, build_dir, log_file)
             if ret != 0:
                 logger.error("cmake failed with return code {}", ret)
                 log_file.write("cmake failed with return code {}\n".format(ret))
                 return
 
-            log_file.write("\n=== Running make ===\n")
-            ret, out, err = run_command("make", build_dir)
-            log_file.write(out)
-            log_file.write(err)
+            build_command = ["cmake", "--build", ".", "--parallel", str(build_jobs)]
+            log_file.write("\n=== Running {} ===\n".format(shlex.join(build_command)))
+            ret = run_command(build_command, build_dir, log_file)
             if ret != 0:
-                logger.error("make failed with return code {}", ret)
-                log_file.write("make failed with return code {}\n".format(ret))
+                logger.error("Build failed with return code {}", ret)
+                log_file.write("Build failed with return code {}\n".format(ret))
             else:
                 logger.info("Build completed successfully in {}", build_dir)
                 log_file.write("Build completed successfully in {}\n".format(build_dir))
+                if archive_stamp is not None:
+                    with open(os.path.join(build_dir, _ARCHIVE_STAMP_NAME), "w") as f:
+                        f.write(archive_stamp + "\n")
     except Exception as e:
         logger.exception("Error during build process in {}: {}", build_dir, e)
 
-def main(input_dir, output_dir):
+def process_archive(archive_path, target_directory, build_jobs=None, force_clean=False):
+    """
+    Extracts a single archive into the target directory and builds the project it contains.
+    Both steps are skipped if the project's last successful build came from an archive with
+    the same contents, unless force_clean is set.
+    """
+    logger.info("Processing archive: {}", archive_path)
+    try:
+        archive_stamp = compute_archive_stamp(archive_path)
+    except OSError as e:
+        logger.warning("Could not compute the stamp of {}, rebuilding: {}", archive_path, e)
+        archive_stamp = None
+    if archive_stamp is not None and not force_clean and is_build_current(target_directory, archive_stamp):
+        logger.info("{} unchanged since the last successful build. Skipping extraction and build.", archive_path)
+        return
+    extract_archive(archive_path, target_directory)
+    build_project(target_directory, build_jobs, archive_stamp)
+
+def iter_archives(directory):
+    """
+    Recursively yields a tuple (entry, stem) for every archive (.tar.gz, .tgz, or .zip) under directory,
+    where entry is its os.DirEntry and stem its name without the archive suffix.
+    Uses os.scandir with an explicit stack, so file and directory checks come from the
+    cached entries and nothing is collected up front.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    kind, stem = classify_archive(entry.name)
+                    if kind is not None:
+                        yield entry, stem
+                    else:
+                        logger.info("Skipping unsupported file: {}", entry.path)
+        # Push in reverse so directories are visited in listing order, like os.walk.
+        stack.extend(reversed(subdirs))
+
+def process_archives(archives, build_jobs=None, force_clean=False):
+    """
+    Extracts and builds, in order, a group of (archive_path, target_directory) pairs.
+    Keeping the group in one worker stops two processes from writing into the same folder.
+    """
+    for archive_path, target_directory in archives:
+        process_archive(archive_path, target_directory, build_jobs, force_clean)
+
+def configure_logging(verbose=False):
+    """
+    Replaces loguru's default sink with the one used by the script.
+    Records are queued to a single writer thread so worker processes do not contend on stderr;
+    debug-level records (per-file renames) are dropped before formatting unless verbose is set.
+    Called in the main process and as the initializer of every worker process, since workers
+    started with spawn or forkserver would otherwise keep loguru's default DEBUG sink.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if verbose else "INFO",
+               enqueue=True, backtrace=False, diagnose=False)
+
+def group_by_target(archives):
+    """
+    Splits (archive_path, target_directory) pairs into groups that are safe to process in parallel.
+    Pairs whose target directories are the same, or one inside the other, share a group, since
+    extracting and cleaning up one of them touches the other's files. Pairs keep their discovery
+    order within a group, and groups are ordered by their first pair.
+    """
+    # Sorting by path components puts each directory right before everything nested in it.
+    parts = [os.path.normpath(target_directory).split(os.path.sep) for _, target_directory in archives]
+    groups = []
+    group_parts = None
+    for index in sorted(range(len(archives)), key=parts.__getitem__):
+        if group_parts is None or parts[index][:len(group_parts)] != group_parts:
+            group_parts = parts[index]
+            groups.append([])
+        groups[-1].append(index)
+    groups.sort(key=min)
+    return [[archives[index] for index in sorted(group)] for group in groups]
+
+def positive_int(value):
+    """
+    argparse type for job counts: accepts integers of at least 1 and rejects everything else.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got {}".format(value))
+    return number
+
+def main(input_dir, output_dir, jobs=None, build_jobs=None, force_clean=False, verbose=False):
     """
     Recursively searches the input_dir for archives.
     For each archive:
@@ -206,43 +582,51 @@ def main(input_dir, output_dir):
       it is removed from the final folder name.
     - If such a folder is detected, the archive's own subfolder is omitted to avoid extra nesting.
     - Extracts the archive into the target directory, simplifies its path, and builds the project.
+    Archives are collected first and then extracted and built in parallel by up to `jobs` worker
+    processes (default: half the CPU cores); the remaining cores go to parallel build jobs
+    unless `build_jobs` sets that number explicitly.
+    Archives unchanged since their project's last successful build are neither extracted nor
+    rebuilt unless `force_clean` is set. Worker processes log with the same settings, see configure_logging().
     """
     if not os.path.isdir(input_dir):
         logger.error("Input directory does not exist: {}", input_dir)
         return
 
-    for root, dirs, files in os.walk(input_dir):
-        for file in files:
-            if file.endswith((".tar.gz", ".tgz", ".zip")):
-                archive_path = os.path.join(root, file)
-                # Compute the relative path with respect to input_dir.
-                rel_path = os.path.relpath(root, input_dir)
-                # Clean the relative path: remove whitespaces and remove the substring "_assignsubmission_file"
-                clean_rel_path = os.path.sep.join(part.replace(" ", "_") for part in rel_path.split(os.path.sep))
-                if "_assignsubmission_file" in clean_rel_path:
-                    clean_rel_path = clean_rel_path.replace("_assignsubmission_file", "")
-                    # When the student's folder already has the assignsubmission substring, do not add an extra project folder.
-                    target_directory = os.path.join(output_dir, clean_rel_path)
-                else:
-                    # Determine the project name (archive name without extension), also remove spaces.
-                    if file.endswith(".tar.gz"):
-                        project_name = file[:-7]
-                    elif file.endswith(".tgz"):
-                        project_name = file[:-4]
-                    elif file.endswith(".zip"):
-                        project_name = file[:-4]
-                    else:
-                        project_name = file
-                    project_name = project_name.replace(" ", "_")
-                    target_directory = os.path.join(output_dir, clean_rel_path, project_name)
-
-                # Ensure the directory for the clean relative path exists.
-                os.makedirs(os.path.join(output_dir, clean_rel_path), exist_ok=True)
-                logger.info("Processing archive: {}", archive_path)
-                extract_archive(archive_path, target_directory)
-                build_project(target_directory)
-            else:
-                logger.info("Skipping unsupported file: {}", os.path.join(root, file))
+    # (archive path, target directory) pairs, in discovery order.
+    archives = []
+    created_directories = set()
+    for entry, stem in iter_archives(input_dir):
+        archive_path = entry.path
+        # Compute the relative path with respect to input_dir.
+        rel_path = os.path.relpath(os.path.dirname(archive_path), input_dir)
+        # Clean the relative path: remove whitespaces and remove the substring "_assignsubmission_file"
+        clean_rel_path = os.path.sep.join(part.replace(" ", "_") for part in rel_path.split(os.path.sep))
+        if "_assignsubmission_file" in clean_rel_path:
+            clean_rel_path = clean_rel_path.replace("_assignsubmission_file", "")
+            # When the student's folder already has the assignsubmission substring, do not add an extra project folder.
+            target_directory = os.path.join(output_dir, clean_rel_path)
+        else:
+            # The project name is the archive name without extension, also without spaces.
+            project_name = stem.replace(" ", "_")
+            target_directory = os.path.join(output_dir, clean_rel_path, project_name)
+
+        # Ensure the directory for the clean relative path exists.
+        ensure_dir(os.path.join(output_dir, clean_rel_path), created_directories)
+        archives.append((archive_path, target_directory))
+
+    if not archives:
+        return
+    groups = group_by_target(archives)
+    # Split the cores between the worker processes and the build jobs each of them starts.
+    cpu_count = os.cpu_count() or 1
+    if jobs is None:
+        jobs = max(1, cpu_count // 2)
+    workers = max(1, min(jobs, len(groups)))
+    if build_jobs is None:
+        build_jobs = max(1, cpu_count // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure_logging,
+                             initargs=(verbose,)) as executor:
+        list(executor.map(partial(process_archives, build_jobs=build_jobs, force_clean=force_clean), groups))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -250,5 +634,14 @@ if __name__ == "__main__":
     )
     parser.add_argument("input_dir", help="Path to the directory containing student archives (e.g. /path/to/archives)")
     parser.add_argument("output_dir", help="Path to the directory where extracted projects will be placed")
+    parser.add_argument("--jobs", type=positive_int, default=None,
+                        help="Number of archives to extract and build in parallel (default: half the CPU cores)")
+    parser.add_argument("--build-jobs", type=positive_int, default=None,
+                        help="Number of parallel compile jobs per project (default: CPU cores divided by --jobs)")
+    parser.add_argument("--force-clean", action="store_true",
+                        help="Always extract and rebuild every archive, even if it is unchanged since the last build")
+    parser.add_argument("--verbose", action="store_true", help="Also log every file and directory rename")
     args = parser.parse_args()
-    main(args.input_dir, args.output_dir)
+
+    configure_logging(args.verbose)
+    main(args.input_dir, args.output_dir, args.jobs, args.build_jobs, args.force_clean, args.verbose)